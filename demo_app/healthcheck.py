@@ -0,0 +1,28 @@
+""" Python file used by the Docker HEALTHCHECK to report whether the chatbot is ready. """
+
+import os
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src import config  # noqa: E402
+
+
+if __name__ == "__main__":
+    # The Streamlit server must be up...
+    try:
+        urllib.request.urlopen(
+            f"http://localhost:{config.SERVER_PORT}/_stcore/health", timeout=5
+        )
+    except Exception as e:
+        print(f"Streamlit server is not healthy: {e}")
+        sys.exit(1)
+
+    # ...and the warm-up must have loaded the index
+    if not os.path.exists(config.READY_PATH):
+        print("Warm-up has not finished yet.")
+        sys.exit(1)
+
+    with open(config.READY_PATH, "r", encoding="utf-8") as f:
+        print(f"Ready: {f.read()}")
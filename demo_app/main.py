@@ -1,16 +1,19 @@
 """ Python file to serve as the front-end of the chatbot. """
 
 import streamlit as st
-from src.agent.llm_agent import LlmAgent
 from src import config
+from src import warmup
 from src.sidebar import sidebar
-from langchain.chains.query_constructor.base import AttributeInfo
 
 
 import time
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from src.agent.llm_agent import LlmAgent
 
-def load_agent() -> LlmAgent:
+
+def load_agent() -> "LlmAgent":
     """
     Logic for loading the chatbot agent and its components.
 
@@ -23,6 +26,10 @@ def load_agent() -> LlmAgent:
     """
     print("🔧 Console: Loading agent..." + "\n")
 
+    # The LangChain stack is imported here so the page renders before it is loaded
+    from src.agent.llm_agent import LlmAgent
+    from langchain.chains.query_constructor.base import AttributeInfo
+
     # set up the metadata field info
     metadata_field_info = [
         AttributeInfo(
@@ -52,6 +59,9 @@ def load_agent() -> LlmAgent:
         google_cse_id=config.CUSTOM_SEARCH_ENGINE_ID,
         document_content_description=document_content_description,
         metadata_field_info=metadata_field_info,
+        llm_cache=warmup.get_llm_cache(),
+        speculative_retrieval=config.SPECULATIVE_RETRIEVAL,
+        vector_store=warmup.get_vector_store(),
     )
     return llm
 
@@ -74,6 +84,9 @@ if __name__ == "__main__":
     if not config.OPENAI_API_KEY:
         st.error("⚠️ Por favor, configure sus credenciales de OpenAI")
     else:
+        # No-op when already started by serve.py
+        warmup.start()
+
         if "agent" not in st.session_state:
             st.session_state["agent"] = load_agent()
 
@@ -102,6 +115,7 @@ if __name__ == "__main__":
                     assistant_response = output = st.session_state["agent"].query(
                         user_input
                     )
+                warmup.record_first_answer()
 
                 # Simulate stream of response with milliseconds delay
                 for chunk in assistant_response.split():
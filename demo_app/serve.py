@@ -0,0 +1,26 @@
+""" Python file to launch the chatbot, warming up its components in the background. """
+
+import os
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Make `src` importable as the same package Streamlit imports from main.py
+sys.path.insert(0, APP_DIR)
+
+from src import config, warmup  # noqa: E402
+from streamlit.web import cli as stcli  # noqa: E402
+
+
+if __name__ == "__main__":
+    # The warm-up shares this process with the Streamlit server, so the index and
+    # connections it loads are reused by the first session
+    warmup.start()
+
+    args = sys.argv[1:]
+    # Listen on the port checked by healthcheck.py unless one is given
+    if not any(arg.startswith("--server.port") for arg in args):
+        args.append(f"--server.port={config.SERVER_PORT}")
+
+    sys.argv = ["streamlit", "run", os.path.join(APP_DIR, "main.py"), *args]
+    sys.exit(stcli.main())
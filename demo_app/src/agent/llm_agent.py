@@ -1,8 +1,10 @@
 from .retriever import Retriever
 from .vector_store import VectorStore
-from .web_search import WebSearch
 from .memory import Memory
+from .llm_cache import LlmCache, CachedEmbeddings
+from .speculative_retriever import SpeculativeRetriever
 
+import langchain
 from langchain.embeddings.openai import OpenAIEmbeddings
 from langchain.chat_models import ChatOpenAI
 from langchain.chains.query_constructor.base import AttributeInfo
@@ -11,7 +13,7 @@ from langchain.agents.agent_toolkits import create_retriever_tool
 from langchain.agents.openai_functions_agent.base import OpenAIFunctionsAgent
 from langchain.schema.messages import SystemMessage
 from langchain.prompts import MessagesPlaceholder
-from typing import List
+from typing import Any, Dict, List, Optional
 
 
 class LlmAgent:
@@ -30,9 +32,13 @@ class LlmAgent:
         document_content_description (str): Brief descriptive text concerning the content being dealt with.
         metadata_field_info (List[AttributeInfo]): Meta-information concerning fields within the content.
         temperature (float, optional): Sampling temperature for the model's responses. Defaults to 0 (deterministic).
+        llm_cache (LlmCache, optional): Disk cache placed beneath every LLM and embedding call. Defaults to None (no cache).
+        speculative_retrieval (bool, optional): Start retrieval on the raw user input in parallel with the agent's planning call. Defaults to False.
+        vector_store (VectorStore, optional): Already loaded vector store to reuse, e.g. one warmed up at startup. Defaults to None (load it).
 
     Methods:
         query(input_text: str) -> str: Accepts user's input and retrieves the agent's response.
+        speculation_stats() -> Dict[str, Any]: Returns the speculative retrieval hit rate and latency saved.
     """
 
     # CONSTANTS
@@ -64,6 +70,9 @@ class LlmAgent:
         document_content_description: str,
         metadata_field_info: List[AttributeInfo],
         temperature: float = 0,
+        llm_cache: Optional[LlmCache] = None,
+        speculative_retrieval: bool = False,
+        vector_store: Optional[VectorStore] = None,
     ) -> None:
         """Initializes the LlmAgent."""
         # Check that all parameters are provided
@@ -80,19 +89,32 @@ class LlmAgent:
         ):
             raise ValueError("All parameters must be provided and not be None.")
 
-        # Initialize embedding function
-        self.embedding = OpenAIEmbeddings()
-
-        # Initialize vector store
-        self.vector_store = VectorStore(
-            persist_directory=persist_directory, embedding=self.embedding
-        )
-
-        # Initialize web search
-        self.web_search = WebSearch(
-            google_api_key=google_api_key,
-            google_cse_id=google_cse_id,
-        )
+        # Set up the response cache, shared by every LLM call made through LangChain
+        self.llm_cache = llm_cache
+        if self.llm_cache is not None:
+            langchain.llm_cache = self.llm_cache
+
+        if vector_store is not None:
+            # Reuse the already loaded vector store and its embedding function
+            self.vector_store = vector_store
+            self.embedding = vector_store.embedding
+        else:
+            # Initialize embedding function
+            self.embedding = OpenAIEmbeddings()
+            if self.llm_cache is not None:
+                self.embedding = CachedEmbeddings(
+                    embedding=self.embedding, cache=self.llm_cache
+                )
+
+            # Initialize vector store
+            self.vector_store = VectorStore(
+                persist_directory=persist_directory, embedding=self.embedding
+            )
+
+        # Web search is rarely used, so it is only built on its first call
+        self.google_api_key = google_api_key
+        self.google_cse_id = google_cse_id
+        self._web_search = None
 
         # Initialize language model
         self.llm = ChatOpenAI(
@@ -109,10 +131,17 @@ class LlmAgent:
             metadata_field_info=metadata_field_info,
         )
 
+        # Wrap the retriever to prefetch documents while the agent plans its first step
+        self.speculative_retriever = None
+        if speculative_retrieval:
+            self.speculative_retriever = SpeculativeRetriever(
+                retriever=self.retriever.retriever
+            )
+
         # Initialize toolkit (retriever tool and web search tool)
         self.toolkit = [
             create_retriever_tool(
-                retriever=self.retriever.retriever,
+                retriever=self.speculative_retriever or self.retriever.retriever,
                 name="retriever",
                 description="Util para cuando necesitas buscar informacion relevante en la base de datos de polizas de seguro",
             ),
@@ -120,7 +149,7 @@ class LlmAgent:
                 name="google_search",
                 description="""Util para cuando necesitas buscar en internet acerca de noticias o informacion
                 relevante a las polizas de seguro en general que no se encuentran en la base de datos de polizas de seguro""",
-                func=self.web_search.google_search_api_wrapper.run,
+                func=self._google_search,
             ),
         ]
 
@@ -151,6 +180,34 @@ class LlmAgent:
             return_intermediate_steps=True,
         )
 
+    @property
+    def web_search(self):
+        """The WebSearch component, initialized on first access."""
+        if self._web_search is None:
+            # Imported here so the Google client is not loaded at startup
+            from .web_search import WebSearch
+
+            self._web_search = WebSearch(
+                google_api_key=self.google_api_key,
+                google_cse_id=self.google_cse_id,
+            )
+        return self._web_search
+
+    def _google_search(self, query: str) -> str:
+        """
+        Runs a Google search through the lazily initialized WebSearch. Results are
+        stored in the response cache when enabled, so replay mode never reaches
+        the network: an unrecorded search raises instead.
+        """
+        if self.llm_cache is None:
+            return self.web_search.google_search_api_wrapper.run(query)
+
+        result = self.llm_cache.get(query, "google_search")
+        if result is None:
+            result = self.web_search.google_search_api_wrapper.run(query)
+            self.llm_cache.put(query, "google_search", result)
+        return result
+
     def query(cls, input_text: str) -> str:
         """
         Accepts a user's query and returns the response from the LLM agent. This function
@@ -169,4 +226,29 @@ class LlmAgent:
             >>> llm.query("Tell me about insurance policies.")
             "Insurance policies are contracts between the insurer and the insured..."
         """
-        return cls.agent_executor({"input": input_text})["output"]
+        if cls.speculative_retriever is None:
+            return cls.agent_executor({"input": input_text})["output"]
+
+        # Retrieve on the raw input while the agent makes its planning call
+        cls.speculative_retriever.prefetch(input_text)
+        try:
+            return cls.agent_executor({"input": input_text})["output"]
+        finally:
+            turn = cls.speculative_retriever.end_turn()
+            outcome = {True: "hit", False: "miss"}.get(turn.get("hit"), "unused")
+            print(
+                f"🔧 Console: Speculative retrieval {outcome}, "
+                f"saved {turn.get('saved_s', 0.0):.2f}s" + "\n"
+            )
+
+    def speculation_stats(cls) -> Dict[str, Any]:
+        """
+        Returns the speculative retrieval statistics accumulated over every query.
+
+        Returns:
+            Dict[str, Any]: Hit rate and latency saved per turn, empty when
+            speculative retrieval is disabled.
+        """
+        if cls.speculative_retriever is None:
+            return {}
+        return cls.speculative_retriever.stats()
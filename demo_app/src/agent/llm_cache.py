@@ -0,0 +1,279 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from typing import Any, List, Optional, Sequence
+
+from langchain.embeddings.base import Embeddings
+from langchain.load.dump import dumps
+from langchain.load.load import loads
+from langchain.schema import BaseCache, Generation
+
+
+class LlmCache(BaseCache):
+    """
+    The LlmCache class is an exact-match cache for LLM responses stored locally on
+    disk in a SQLite file. Entries are keyed by the serialized messages and the
+    LLM string, which LangChain builds from the model name, its parameters and
+    the functions passed to the call. When the SQLite file grows beyond the
+    maximum size the least recently used entries are evicted and the freed pages
+    are returned to the filesystem.
+
+    The cache supports the following modes:
+    - read_write: Responses are read from the cache and new ones are stored.
+    - record: The API is always called and every response is stored.
+    - replay: Responses are only read from the cache, a miss raises an error
+      instead of calling the API. The cache file is opened read-only.
+
+    Attributes:
+        path (str): Path to the SQLite file backing the cache.
+        mode (str): One of "read_write", "record" or "replay".
+        max_size_bytes (int): Maximum size of the SQLite file.
+
+    """
+
+    MODES = ("read_write", "record", "replay")
+
+    def __init__(self, path: str, mode: str = "read_write", max_size_mb: int = 256):
+        """Initialize the LlmCache with required components."""
+        if not all([path, mode, max_size_mb]):
+            raise ValueError("All parameters must be provided and not be None.")
+
+        if mode not in self.MODES:
+            raise ValueError(f"Cache mode must be one of {', '.join(self.MODES)}.")
+
+        self.path = path
+        self.mode = mode
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+
+        self._lock = threading.Lock()
+        self._connection = self._initialize_connection(path)
+
+    def _initialize_connection(self, path: str) -> sqlite3.Connection:
+        """
+        Internal method to initialize the SQLite connection and the cache table.
+
+        Args:
+            path (str): Path to the SQLite file.
+
+        Returns:
+            sqlite3.Connection: Initialized connection, shared between threads.
+        """
+        if self.mode == "replay":
+            return self._initialize_replay_connection(path)
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        connection = sqlite3.connect(path, check_same_thread=False)
+
+        # Incremental auto-vacuum lets eviction shrink the file. It only applies
+        # to an existing file after a VACUUM.
+        if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("VACUUM")
+
+        connection.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        connection.commit()
+        return connection
+
+    @staticmethod
+    def _initialize_replay_connection(path: str) -> sqlite3.Connection:
+        """
+        Internal method to open a recorded cache file read-only, failing fast when
+        there is nothing to replay.
+
+        Args:
+            path (str): Path to the SQLite file.
+
+        Returns:
+            sqlite3.Connection: Read-only connection, shared between threads.
+        """
+        if not os.path.exists(path):
+            raise ValueError(f"No recorded cache found at {path} for replay mode.")
+
+        connection = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, check_same_thread=False
+        )
+        table = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'llm_cache'"
+        ).fetchone()
+        if table is None:
+            connection.close()
+            raise ValueError(f"The file at {path} is not a recorded cache.")
+        return connection
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """Build the cache key for a prompt and LLM string."""
+        payload = "\x00".join([llm_string, prompt])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, prompt: str, llm_string: str) -> Optional[str]:
+        """
+        Returns the raw value stored for a prompt and LLM string, honoring the
+        cache mode.
+
+        Args:
+            prompt (str): Serialized prompt or messages.
+            llm_string (str): Serialized model and call parameters.
+
+        Returns:
+            Optional[str]: The stored value, or None on a miss.
+        """
+        if self.mode == "record":
+            return None
+
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            # Replay keeps the recorded file untouched, so access times are not updated
+            if row is not None and self.mode != "replay":
+                self._connection.execute(
+                    "UPDATE llm_cache SET last_access = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                self._connection.commit()
+
+        if row is None and self.mode == "replay":
+            raise ValueError(
+                "No recorded response found for this request while in replay mode."
+            )
+        return row[0] if row is not None else None
+
+    def put(self, prompt: str, llm_string: str, value: str) -> None:
+        """
+        Stores a raw value for a prompt and LLM string, evicting the least
+        recently used entries when the maximum size is exceeded.
+
+        Args:
+            prompt (str): Serialized prompt or messages.
+            llm_string (str): Serialized model and call parameters.
+            value (str): Serialized value to store.
+        """
+        if self.mode == "replay":
+            return
+
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, last_access) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._connection.commit()
+            self._evict()
+
+    def _file_size(self) -> int:
+        """Size of the SQLite file in bytes."""
+        page_count = self._connection.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self._connection.execute("PRAGMA page_size").fetchone()[0]
+        return page_count * page_size
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries until the file fits its size."""
+        while self._file_size() > self.max_size_bytes:
+            count = self._connection.execute(
+                "SELECT COUNT(*) FROM llm_cache"
+            ).fetchone()[0]
+            if count == 0:
+                break
+
+            # Evict a tenth of the entries at a time, then release the freed pages
+            self._connection.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (max(count // 10, 1),),
+            )
+            self._connection.commit()
+            self._connection.execute("PRAGMA incremental_vacuum").fetchall()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """Look up the generations stored for a prompt and LLM string."""
+        value = self.get(prompt, llm_string)
+        if value is None:
+            return None
+        return [loads(generation) for generation in json.loads(value)]
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        """Store the generations returned for a prompt and LLM string."""
+        self.put(
+            prompt,
+            llm_string,
+            json.dumps([dumps(generation) for generation in return_val]),
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        """Delete every entry from the cache."""
+        if self.mode == "replay":
+            return
+
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_cache")
+            self._connection.commit()
+            self._connection.execute("PRAGMA incremental_vacuum").fetchall()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    The CachedEmbeddings class wraps an embeddings model so that its vectors are
+    stored in the LlmCache, allowing the vector store queries to run without
+    network access in replay mode.
+
+    Attributes:
+        embedding (Embeddings): The wrapped embeddings model.
+        cache (LlmCache): The cache holding the vectors.
+
+    """
+
+    def __init__(self, embedding: Embeddings, cache: LlmCache):
+        """Initialize the CachedEmbeddings with required components."""
+        if not all([embedding, cache]):
+            raise ValueError("All parameters must be provided and not be None.")
+
+        self.embedding = embedding
+        self.cache = cache
+        self.namespace = "embedding:" + str(getattr(embedding, "model", ""))
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reading the vector from the cache when possible."""
+        value = self.cache.get(text, self.namespace)
+        if value is not None:
+            return json.loads(value)
+
+        vector = self.embedding.embed_query(text)
+        self.cache.put(text, self.namespace, json.dumps(vector))
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents, one cache entry per document."""
+        vectors = [self.cache.get(text, self.namespace) for text in texts]
+        missing = [i for i, value in enumerate(vectors) if value is None]
+
+        # Only the documents missing from the cache are sent to the model, in one batch
+        embedded = (
+            self.embedding.embed_documents([texts[i] for i in missing])
+            if missing
+            else []
+        )
+        for i, vector in zip(missing, embedded):
+            self.cache.put(texts[i], self.namespace, json.dumps(vector))
+            vectors[i] = vector
+
+        return [
+            json.loads(vector) if isinstance(vector, str) else vector
+            for vector in vectors
+        ]
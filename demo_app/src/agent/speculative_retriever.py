@@ -0,0 +1,197 @@
+import re
+import threading
+import time
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from langchain.callbacks.manager import CallbackManagerForRetrieverRun
+from langchain.chains.query_constructor.ir import StructuredQuery
+from langchain.pydantic_v1 import PrivateAttr
+from langchain.retrievers.self_query.base import SelfQueryRetriever
+from langchain.schema import BaseRetriever, Document
+
+# Shared by every agent, so idle sessions do not each keep a worker thread alive
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="speculative-retrieval"
+)
+
+
+class SpeculativeRetriever(BaseRetriever):
+    """
+    The SpeculativeRetriever class wraps a SelfQueryRetriever so that a similarity
+    search (query embedding and Chroma search) can be started on the raw user
+    input in a worker thread, while the agent is still making its planning call.
+
+    When the agent calls the retriever, the self-query constructor still runs on
+    its query. The prefetched documents are only reused when the constructed
+    query has no metadata filter, uses a plain similarity search and its text is
+    the same or similar to the raw input. Otherwise they are discarded and the
+    constructed query is searched as usual, so the answers are the same as
+    without speculation.
+
+    Attributes:
+        retriever (SelfQueryRetriever): The wrapped retriever.
+        k (int): Number of documents returned by the prefetch.
+        similarity_threshold (float): Minimum word overlap (Jaccard) between the
+            user input and the constructed query to reuse the prefetched documents.
+
+    """
+
+    retriever: SelfQueryRetriever
+    k: int = 4
+    similarity_threshold: float = 0.6
+
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _query: Optional[str] = PrivateAttr(default=None)
+    _future: Optional[Future] = PrivateAttr(default=None)
+    _turn: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _stats: Dict[str, float] = PrivateAttr(
+        default_factory=lambda: {
+            "turns": 0,
+            "hits": 0,
+            "misses": 0,
+            "unused": 0,
+            "saved_s": 0.0,
+        }
+    )
+
+    def prefetch(self, query: str) -> None:
+        """
+        Starts the similarity search for a query in a worker thread.
+
+        Args:
+            query (str): The raw user input.
+        """
+        with self._lock:
+            self._query = query
+            self._future = _EXECUTOR.submit(self._timed_retrieval, query)
+            self._turn = {"hit": None, "saved_s": 0.0}
+
+    def _timed_retrieval(self, query: str) -> Dict[str, Any]:
+        """Internal method to run the search recording when it started and ended."""
+        started_at = time.perf_counter()
+        documents = self.retriever.vectorstore.similarity_search(query, k=self.k)
+        return {
+            "documents": documents,
+            "started_at": started_at,
+            "finished_at": time.perf_counter(),
+        }
+
+    @staticmethod
+    def _tokens(text: str) -> set:
+        return set(re.findall(r"\w+", text.lower()))
+
+    def _is_similar(self, query: str, prefetched_query: str) -> bool:
+        """Checks whether the agent's query is close enough to the prefetched one."""
+        tokens, prefetched_tokens = self._tokens(query), self._tokens(prefetched_query)
+        if not tokens or not prefetched_tokens:
+            return query.strip() == prefetched_query.strip()
+        overlap = len(tokens & prefetched_tokens) / len(tokens | prefetched_tokens)
+        return overlap >= self.similarity_threshold
+
+    def _construct_query(
+        self, query: str, run_manager: CallbackManagerForRetrieverRun
+    ) -> tuple:
+        """
+        Internal method to run the self-query constructor the same way the
+        wrapped SelfQueryRetriever does.
+
+        Returns:
+            tuple: The query to search and the search keyword arguments.
+        """
+        retriever = self.retriever
+        inputs = retriever.llm_chain.prep_inputs({"query": query})
+        structured_query: StructuredQuery = retriever.llm_chain.predict_and_parse(
+            callbacks=run_manager.get_child(), **inputs
+        )
+        (
+            new_query,
+            new_kwargs,
+        ) = retriever.structured_query_translator.visit_structured_query(
+            structured_query
+        )
+        if structured_query.limit is not None:
+            new_kwargs["k"] = structured_query.limit
+        if retriever.use_original_query:
+            new_query = query
+        return new_query, {**retriever.search_kwargs, **new_kwargs}
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """Returns the prefetched documents when possible, otherwise searches."""
+        new_query, search_kwargs = self._construct_query(query, run_manager)
+
+        requested_at = time.perf_counter()
+        with self._lock:
+            future, prefetched_query = self._future, self._query
+            # The prefetched result can only be used once per turn
+            self._future, self._query = None, None
+
+        reusable = (
+            future is not None
+            and "filter" not in search_kwargs
+            and self.retriever.search_type == "similarity"
+            and search_kwargs.get("k", 4) <= self.k
+            and self._is_similar(new_query, prefetched_query)
+        )
+        if reusable:
+            try:
+                result = future.result()
+            except Exception:
+                # A failed prefetch must not fail the turn, search as usual
+                result = None
+            if result is not None:
+                saved = min(requested_at, result["finished_at"]) - result["started_at"]
+                self._turn = {"hit": True, "saved_s": max(saved, 0.0)}
+                return result["documents"][: search_kwargs.get("k", 4)]
+
+        if future is not None:
+            self._turn = {"hit": False, "saved_s": 0.0}
+
+        return self.retriever.vectorstore.search(
+            new_query, self.retriever.search_type, **search_kwargs
+        )
+
+    def end_turn(self) -> Dict[str, Any]:
+        """
+        Closes the current turn, discarding any prefetched documents that were not
+        used, and updates the statistics.
+
+        Returns:
+            Dict[str, Any]: Whether the prefetch was used (None when the retriever
+            was not called) and the latency it saved.
+        """
+        with self._lock:
+            if self._future is None and self._query is None and not self._turn:
+                return {}
+            self._future, self._query = None, None
+            turn, self._turn = self._turn, {}
+
+        self._stats["turns"] += 1
+        if turn.get("hit") is True:
+            self._stats["hits"] += 1
+        elif turn.get("hit") is False:
+            self._stats["misses"] += 1
+        else:
+            # The agent answered without calling the retriever
+            self._stats["unused"] += 1
+        self._stats["saved_s"] += turn.get("saved_s", 0.0)
+
+        return {"hit": turn.get("hit"), "saved_s": turn.get("saved_s", 0.0)}
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns the speculative retrieval statistics accumulated over every turn.
+
+        Returns:
+            Dict[str, float]: Number of turns, hits, misses and unused prefetches,
+            the hit rate and the mean latency saved per turn.
+        """
+        turns = self._stats["turns"]
+        return {
+            **self._stats,
+            "hit_rate": self._stats["hits"] / turns if turns else 0.0,
+            "saved_per_turn_s": self._stats["saved_s"] / turns if turns else 0.0,
+        }
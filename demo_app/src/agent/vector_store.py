@@ -1,11 +1,37 @@
 import glob
 import os
+import threading
+
+from typing import Any
 
 from chromadb.config import Settings
 from langchain.embeddings.openai import OpenAIEmbeddings
 from langchain.vectorstores import Chroma
 
 
+class _LockedCollection:
+    """
+    Wraps a Chroma collection so that its calls are serialized. The chromadb client
+    runs every query through a single database connection, which is not thread-safe,
+    and the vector store is shared by every session.
+    """
+
+    def __init__(self, collection: Any, lock: threading.RLock):
+        self._collection = collection
+        self._lock = lock
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._collection, name)
+        if not callable(attribute):
+            return attribute
+
+        def locked(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+
+        return locked
+
+
 class VectorStore:
     """
     The VectorStore class provides a simplified interface for fetching data using
@@ -14,6 +40,7 @@ class VectorStore:
     Attributes:
         persist_directory (str): The directory where the vector store will be saved.
         embedding (OpenAIEmbeddings): The OpenAIEmbeddings instance.
+        lock (threading.RLock): Lock serializing every access to the collection.
 
     """
 
@@ -26,19 +53,41 @@ class VectorStore:
         if not glob.glob(os.path.join(persist_directory, "*.parquet")):
             raise ValueError("No vector store found in the persist directory.")
 
+        self.embedding = embedding
+        self.lock = threading.RLock()
         self.vector_store = self._initialize_vector_store(persist_directory, embedding)
 
-    def _initialize_vector_store(
-        self, persist_directory: str, embedding: OpenAIEmbeddings
-    ) -> Chroma:
-        """Initialize the vector store."""
-        settings = Settings(
+    @staticmethod
+    def client_settings(persist_directory: str) -> Settings:
+        """Chroma client settings used to open the persisted vector store."""
+        return Settings(
             chroma_db_impl="sqlite",
             persist_directory=persist_directory,
             anonymized_telemetry=False,
         )
-        return Chroma(
+
+    def _initialize_vector_store(
+        self, persist_directory: str, embedding: OpenAIEmbeddings
+    ) -> Chroma:
+        """Initialize the vector store."""
+        vector_store = Chroma(
             embedding_function=embedding,
-            client_settings=settings,
+            client_settings=self.client_settings(persist_directory),
             persist_directory=persist_directory,
         )
+        vector_store._collection = _LockedCollection(
+            vector_store._collection, self.lock
+        )
+        return vector_store
+
+    def warm(self) -> None:
+        """
+        Runs a first search with an embedding already stored in the collection, so
+        that the index is loaded into memory before the first user query without
+        calling the embeddings API.
+        """
+        sample = self.vector_store._collection.get(limit=1, include=["embeddings"])
+        if not sample["embeddings"]:
+            raise ValueError("The vector store is empty.")
+
+        self.vector_store.similarity_search_by_vector(sample["embeddings"][0], k=1)
@@ -1,12 +1,15 @@
 from pathlib import Path
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Define paths
 DATASET_ROOT_PATH = str(Path(__file__).parent.parent / "dataset")
 ENV_PATH = str(Path(__file__).parent.parent / ".env")
 CHROMA_PATH = str(Path(__file__).parent.parent / "chroma")
+LLM_CACHE_PATH = str(Path(__file__).parent.parent / "llm_cache" / "llm_cache.db")
 LOGO = str(Path(__file__).parent.parent / "assets/logo.png")
+READY_PATH = str(Path(tempfile.gettempdir()) / "policypro.ready")
 
 # Define Constants
 S3_BUCKET_NAME = "anyoneai-datasets"
@@ -20,6 +23,10 @@ AWS_ACCESS_KEY_ID = str(os.getenv("AWS_ACCESS_KEY_ID"))
 AWS_SECRET_ACCESS_KEY = str(os.getenv("AWS_SECRET_ACCESS_KEY"))
 OPENAI_API_KEY = str(os.getenv("OPENAI_API_KEY"))
 FAST_LLM_MODEL = str(os.getenv("FAST_LLM_MODEL"))
-TEMPERATURE = float(os.getenv("TEMPERATURE"))
+TEMPERATURE = float(os.getenv("TEMPERATURE", "0"))
 GOOGLE_API_KEY = str(os.getenv("GOOGLE_API_KEY"))
 CUSTOM_SEARCH_ENGINE_ID = str(os.getenv("CUSTOM_SEARCH_ENGINE_ID"))
+LLM_CACHE_MODE = str(os.getenv("LLM_CACHE_MODE", "off"))
+LLM_CACHE_MAX_SIZE_MB = int(os.getenv("LLM_CACHE_MAX_SIZE_MB", "256"))
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8501"))
+SPECULATIVE_RETRIEVAL = os.getenv("SPECULATIVE_RETRIEVAL", "false").lower() == "true"
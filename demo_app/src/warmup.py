@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+
+from typing import Any, Dict
+from src import config
+
+# Used as the reference for the time-to-first-answer measurement
+PROCESS_START = time.perf_counter()
+
+_lock = threading.RLock()
+_started = False
+_llm_cache = None
+_vector_store = None
+_first_answer_reported = False
+
+timings: Dict[str, float] = {}
+
+
+def get_llm_cache() -> Any:
+    """
+    Returns the response cache shared by every session, or None when the cache
+    is disabled.
+
+    Returns:
+        Optional[LlmCache]: The shared response cache.
+    """
+    global _llm_cache
+
+    if config.LLM_CACHE_MODE == "off":
+        return None
+
+    with _lock:
+        if _llm_cache is None:
+            from src.agent.llm_cache import LlmCache
+
+            _llm_cache = LlmCache(
+                path=config.LLM_CACHE_PATH,
+                mode=config.LLM_CACHE_MODE,
+                max_size_mb=config.LLM_CACHE_MAX_SIZE_MB,
+            )
+    return _llm_cache
+
+
+def get_vector_store() -> Any:
+    """
+    Returns the vector store shared by every session, loading it from the index
+    snapshot on first use. Blocks while the warm-up thread is still loading it.
+
+    Returns:
+        VectorStore: The shared vector store.
+    """
+    global _vector_store
+
+    with _lock:
+        if _vector_store is None:
+            from langchain.embeddings.openai import OpenAIEmbeddings
+            from src.agent.llm_cache import CachedEmbeddings
+            from src.agent.vector_store import VectorStore
+
+            embedding = OpenAIEmbeddings()
+            llm_cache = get_llm_cache()
+            if llm_cache is not None:
+                embedding = CachedEmbeddings(embedding=embedding, cache=llm_cache)
+
+            _vector_store = VectorStore(
+                persist_directory=config.CHROMA_PATH, embedding=embedding
+            )
+    return _vector_store
+
+
+def warm_connections() -> None:
+    """
+    Shares one HTTP session between every OpenAI call and opens its connection
+    with a cheap request, so the first answer skips the TLS handshake. Skipped in
+    replay mode, which never reaches the network.
+
+    Returns:
+        None
+    """
+    if config.LLM_CACHE_MODE == "replay":
+        return
+
+    import openai
+    import requests
+
+    # Without a shared session openai opens a new one in every thread
+    openai.requestssession = requests.Session()
+    openai.Model.retrieve(config.FAST_LLM_MODEL, api_key=config.OPENAI_API_KEY)
+
+
+def warm_up() -> None:
+    """
+    Imports the agent stack, loads the index, runs a first search and opens the
+    OpenAI connection, then writes the readiness file checked by the Docker
+    HEALTHCHECK.
+
+    Returns:
+        None
+    """
+    try:
+        start = time.perf_counter()
+        import src.agent.llm_agent  # noqa: F401
+
+        timings["import_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vector_store = get_vector_store()
+        timings["index_load_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vector_store.warm()
+        timings["warm_s"] = time.perf_counter() - start
+    except Exception as e:
+        print(f"🔧 Console: Warm-up failed: {e}" + "\n")
+        return
+
+    # The app can still answer with cold connections, so a failure is not fatal
+    start = time.perf_counter()
+    try:
+        warm_connections()
+    except Exception as e:
+        print(f"🔧 Console: Connection warm-up failed: {e}" + "\n")
+    timings["connect_s"] = time.perf_counter() - start
+
+    timings["ready_s"] = time.perf_counter() - PROCESS_START
+    with open(config.READY_PATH, "w", encoding="utf-8") as f:
+        json.dump(timings, f)
+
+    print(
+        "🔧 Console: Ready in {ready_s:.2f}s (imports {import_s:.2f}s, "
+        "index load {index_load_s:.2f}s, warm-up {warm_s:.2f}s, "
+        "connections {connect_s:.2f}s)".format(**timings) + "\n"
+    )
+
+
+def start() -> None:
+    """
+    Starts the warm-up in a background thread. Only the first call has an effect.
+
+    Returns:
+        None
+    """
+    global _started
+
+    with _lock:
+        if _started:
+            return
+        _started = True
+
+        # Remove the readiness file left by a previous run
+        if os.path.exists(config.READY_PATH):
+            os.remove(config.READY_PATH)
+
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+
+def record_first_answer() -> None:
+    """
+    Logs the time between startup and the first answer. Only the first call has
+    an effect.
+
+    Returns:
+        None
+    """
+    global _first_answer_reported
+
+    with _lock:
+        if _first_answer_reported:
+            return
+        _first_answer_reported = True
+
+    timings["first_answer_s"] = time.perf_counter() - PROCESS_START
+    print(f"🔧 Console: Time to first answer {timings['first_answer_s']:.2f}s" + "\n")
@@ -0,0 +1,135 @@
+""" Script to evaluate the retrieval quality and latency of every chunking and retriever configuration. """
+
+import argparse
+import json
+
+from langchain.chains.query_constructor.base import AttributeInfo
+from langchain.chat_models import ChatOpenAI
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.embeddings.openai import OpenAIEmbeddings
+from langchain.schema.messages import HumanMessage
+from langchain.storage import LocalFileStore
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.vectorstores import Chroma
+
+from src import config
+from src import etl
+from src import evaluation
+
+
+ANSWER_TEMPLATE = """Utiliza las siguientes piezas de contexto para responder a la pregunta al final. Si no sabes la respuesta, simplemente di que no lo sabes, no intentes inventar una respuesta. Mantén la respuesta lo más concisa posible.
+{context}
+Pregunta: {question}
+Respuesta útil:"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--chunking",
+        nargs="+",
+        default=["1000:150"],
+        help="Chunking settings to compare as chunk_size:chunk_overlap",
+    )
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--chunks-per-policy", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument(
+        "--grade", action="store_true", help="Also answer and grade every question"
+    )
+    parser.add_argument("--output", help="Path to write the report as JSON")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    documents = etl.preprocess(etl.load_documents_with_title(config.DATASET_ROOT_PATH))
+    llm = ChatOpenAI(
+        openai_api_key=config.OPENAI_API_KEY,
+        model_name=config.FAST_LLM_MODEL,
+        temperature=config.TEMPERATURE,
+    )
+    # Chunk embeddings are cached on disk, so reruns only embed the new chunks
+    underlying_embedding = OpenAIEmbeddings()
+    embedding = CacheBackedEmbeddings.from_bytes_store(
+        underlying_embedding,
+        LocalFileStore(config.EVAL_EMBEDDING_CACHE_PATH),
+        namespace=underlying_embedding.model,
+    )
+
+    metadata_field_info = [
+        AttributeInfo(
+            name="source",
+            type="string",
+            description="el nombre de archivo y codigo de la poliza de donde vino este fragmento, el formato es POL{codigo de poliza}.pdf",
+        ),
+        AttributeInfo(
+            name="page", type="integer", description="El numero de pagina de la poliza"
+        ),
+        AttributeInfo(
+            name="title", type="string", description="El titulo de la poliza"
+        ),
+    ]
+    document_content_description = "Polizas de Seguro"
+
+    # The QA pairs are generated once from the reference chunking, so that every
+    # configuration is measured against the same questions
+    reference_chunks = RecursiveCharacterTextSplitter(
+        chunk_size=1000, chunk_overlap=150, length_function=len, strip_whitespace=True
+    ).split_documents(documents)
+    examples = evaluation.generate_qa_pairs(
+        reference_chunks,
+        llm,
+        evaluation.QACache(config.EVAL_CACHE_PATH),
+        model_name=config.FAST_LLM_MODEL,
+        chunks_per_policy=args.chunks_per_policy,
+        max_workers=args.max_workers,
+    )
+    print(f"Evaluating on {len(examples)} QA pairs.")
+
+    def answer(question, docs):
+        context = "\n\n".join(doc.page_content for doc in docs)
+        message = HumanMessage(
+            content=ANSWER_TEMPLATE.format(context=context, question=question)
+        )
+        return llm([message]).content
+
+    full_report = {}
+    for setting in args.chunking:
+        chunk_size, chunk_overlap = (int(value) for value in setting.split(":"))
+        chunks = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+            strip_whitespace=True,
+        ).split_documents(documents)
+
+        # In-memory collection, the persisted index is left untouched
+        vector_store = Chroma.from_documents(
+            chunks, embedding, collection_name=f"eval_{chunk_size}_{chunk_overlap}"
+        )
+        retrievers = evaluation.build_retrievers(
+            vector_store,
+            chunks,
+            llm,
+            document_content_description,
+            metadata_field_info,
+            k=args.k,
+        )
+        report = evaluation.run_evaluation(
+            retrievers,
+            examples,
+            answer=answer if args.grade else None,
+            grader_llm=llm if args.grade else None,
+            k=args.k,
+            max_workers=args.max_workers,
+        )
+
+        print(f"\nChunking {chunk_size}:{chunk_overlap} ({len(chunks)} chunks)")
+        evaluation.print_report(report)
+        full_report[setting] = report
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(full_report, f, indent=2)
@@ -6,6 +6,10 @@ from dotenv import load_dotenv
 DATASET_ROOT_PATH = str(Path(__file__).parent.parent / "dataset")
 ENV_PATH = str(Path(__file__).parent.parent / ".env")
 CHROMA_PATH = str(Path(__file__).parent.parent / "chroma")
+EVAL_CACHE_PATH = str(Path(__file__).parent.parent / "eval_cache" / "qa_pairs.json")
+EVAL_EMBEDDING_CACHE_PATH = str(
+    Path(__file__).parent.parent / "eval_cache" / "embeddings"
+)
 
 # Define Constants
 S3_BUCKET_NAME = "anyoneai-datasets"
@@ -0,0 +1,385 @@
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain.base_language import BaseLanguageModel
+from langchain.chains.query_constructor.base import AttributeInfo
+from langchain.docstore.document import Document
+from langchain.evaluation.qa import QAEvalChain
+from langchain.output_parsers.regex import RegexParser
+from langchain.prompts import PromptTemplate
+from langchain.retrievers import BM25Retriever, EnsembleRetriever
+from langchain.retrievers.self_query.base import SelfQueryRetriever
+from langchain.schema import BaseRetriever
+from langchain.vectorstores import Chroma
+
+from src.custom_qa_generate_chain import CustomQAGenerateChain
+
+
+EVAL_TEMPLATE = """Eres un profesor y estas conformando preguntas para hacer en un cuestionario.
+Dado el siguiente documento, genere una pregunta y una respuesta basada en ese documento.
+
+Ejemplo de formato del cuestionario:
+<Documento Inicio>
+...
+<Documento Fin>
+PREGUNTA: Aqui va la pregunta
+RESPUESTA: Aqui va la respuesta
+
+Estas preguntas deben ser detalladas y basarse explícitamente en la información del documento. Comencemos!
+
+<Documento Inicio>
+{doc}
+<Documento Fin>"""
+
+EVAL_PROMPT = PromptTemplate(
+    input_variables=["doc"],
+    template=EVAL_TEMPLATE,
+    output_parser=RegexParser(
+        regex=r"PREGUNTA: (.*?)\n+RESPUESTA: (.*)", output_keys=["query", "answer"]
+    ),
+)
+
+
+class QACache:
+    """
+    A small JSON file cache for generated QA pairs, keyed by the model, the
+    prompt template and the content of the chunk the pair was generated from.
+    Safe to use from several worker threads.
+
+    Attributes:
+        path (str): Path to the JSON file backing the cache.
+
+    """
+
+    def __init__(self, path: str):
+        """Initialize the QACache, loading any previously stored entries."""
+        if not path:
+            raise ValueError("All parameters must be provided and not be None.")
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """Load the cache entries from disk."""
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def key(model_name: str, template: str, content: str) -> str:
+        """Build the cache key for a chunk."""
+        payload = "\x00".join([model_name, template, content])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, value: Dict[str, str]) -> None:
+        with self._lock:
+            self._entries[key] = value
+
+    def save(self) -> None:
+        """Persist the cache entries to disk."""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with self._lock:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+
+
+def _chunk_id(document: Document) -> str:
+    """
+    Identifies the location a chunk comes from. Source and page are used instead
+    of the chunk content so that QA pairs stay valid across chunking settings.
+    """
+    return f"{document.metadata.get('source')}#{document.metadata.get('page')}"
+
+
+def generate_qa_pairs(
+    chunks: List[Document],
+    llm: BaseLanguageModel,
+    cache: QACache,
+    model_name: str,
+    chunks_per_policy: int = 3,
+    max_workers: int = 8,
+    seed: int = 42,
+) -> List[Dict[str, str]]:
+    """
+    Generates QA pairs for a sample of chunks of every policy. Policies are
+    processed concurrently and already generated pairs are read from the cache.
+
+    Parameters:
+    - chunks (List[Document]): Chunks to sample from.
+    - llm (BaseLanguageModel): Language Model used to generate the pairs.
+    - cache (QACache): Cache of previously generated pairs.
+    - model_name (str): Name of the model, used as part of the cache key.
+    - chunks_per_policy (int): Number of chunks sampled from each policy.
+    - max_workers (int): Maximum number of concurrent generation calls.
+    - seed (int): Seed used to sample the chunks.
+
+    Returns:
+    - examples (List[Dict[str, str]]): QA pairs with "query", "answer" and "chunk_id".
+    """
+    chain = CustomQAGenerateChain.from_llm(llm=llm, eval_prompt=EVAL_PROMPT)
+
+    # Group the chunks by policy
+    policies = defaultdict(list)
+    for chunk in chunks:
+        policies[chunk.metadata.get("source")].append(chunk)
+
+    rng = random.Random(seed)
+    sampled = {
+        source: rng.sample(items, min(chunks_per_policy, len(items)))
+        for source, items in sorted(policies.items())
+    }
+
+    def _generate(policy_chunks: List[Document]) -> List[Dict[str, str]]:
+        examples = []
+        for chunk in policy_chunks:
+            key = cache.key(model_name, EVAL_TEMPLATE, chunk.page_content)
+            example = cache.get(key)
+            if example is None:
+                try:
+                    parsed = chain.apply_and_parse([{"doc": chunk.page_content}])[0]
+                except ValueError:
+                    # The model did not follow the expected output format
+                    continue
+                example = {
+                    "query": parsed["query"],
+                    "answer": parsed["answer"],
+                    "chunk_id": _chunk_id(chunk),
+                }
+                cache.set(key, example)
+            examples.append(example)
+        return examples
+
+    # Save even when a worker fails, so the pairs generated so far are not lost
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_generate, sampled.values()))
+    finally:
+        cache.save()
+
+    return [example for policy_examples in results for example in policy_examples]
+
+
+def build_retrievers(
+    vector_store: Chroma,
+    chunks: List[Document],
+    llm: BaseLanguageModel,
+    document_content_description: str,
+    metadata_field_info: List[AttributeInfo],
+    k: int = 5,
+) -> Dict[str, BaseRetriever]:
+    """
+    Builds every retriever configuration to be compared.
+
+    Parameters:
+    - vector_store (Chroma): Vector store holding the chunks.
+    - chunks (List[Document]): Chunks indexed in the vector store, used for BM25.
+    - llm (BaseLanguageModel): Language Model used by the self-query retriever.
+    - document_content_description (str): Description of the document content.
+    - metadata_field_info (List[AttributeInfo]): Document metadata field info.
+    - k (int): Number of documents returned by each retriever.
+
+    Returns:
+    - retrievers (Dict[str, BaseRetriever]): Retrievers by configuration name.
+    """
+    similarity = vector_store.as_retriever(search_kwargs={"k": k})
+
+    bm25 = BM25Retriever.from_documents(chunks)
+    bm25.k = k
+
+    return {
+        "similarity": similarity,
+        "mmr": vector_store.as_retriever(
+            search_type="mmr", search_kwargs={"k": k, "fetch_k": 4 * k}
+        ),
+        "self_query": SelfQueryRetriever.from_llm(
+            llm,
+            vector_store,
+            document_content_description,
+            metadata_field_info,
+            search_kwargs={"k": k},
+        ),
+        "hybrid": EnsembleRetriever(retrievers=[bm25, similarity], weights=[0.5, 0.5]),
+    }
+
+
+def evaluate_retriever(
+    retriever: BaseRetriever,
+    examples: List[Dict[str, str]],
+    k: int = 5,
+) -> Dict[str, Any]:
+    """
+    Measures recall@k, MRR and per-query latency of a retriever. A retrieved
+    chunk is relevant when it comes from the same policy page as the chunk
+    the question was generated from.
+
+    Parameters:
+    - retriever (BaseRetriever): Retriever to evaluate.
+    - examples (List[Dict[str, str]]): QA pairs with "query" and "chunk_id".
+    - k (int): Cut-off used for recall.
+
+    Returns:
+    - metrics (Dict[str, Any]): Aggregated metrics and the retrieved documents.
+    """
+    hits, reciprocal_ranks, latencies, retrieved = 0, [], [], []
+
+    for example in examples:
+        start = time.perf_counter()
+        documents = retriever.get_relevant_documents(example["query"])[:k]
+        latencies.append(time.perf_counter() - start)
+        retrieved.append(documents)
+
+        ids = [_chunk_id(document) for document in documents]
+        if example["chunk_id"] in ids:
+            hits += 1
+            reciprocal_ranks.append(1 / (ids.index(example["chunk_id"]) + 1))
+        else:
+            reciprocal_ranks.append(0.0)
+
+    latencies_sorted = sorted(latencies)
+    total = max(len(examples), 1)
+
+    return {
+        f"recall@{k}": hits / total,
+        "mrr": sum(reciprocal_ranks) / total,
+        "latency_mean_s": sum(latencies) / total,
+        "latency_p50_s": latencies_sorted[len(latencies) // 2] if latencies else 0.0,
+        "latency_p95_s": latencies_sorted[int(len(latencies) * 0.95)]
+        if latencies
+        else 0.0,
+        "retrieved": retrieved,
+    }
+
+
+def _parse_grade(text: str) -> str:
+    """
+    Extracts the grade from the raw QAEvalChain output, which may look like
+    "CORRECT", "CORRECT." or "GRADE: INCORRECT". INCORRECT is matched as a whole
+    word first so it is never read as CORRECT.
+    """
+    match = re.search(r"\b(INCORRECT|CORRECT)\b", text.upper())
+    return match.group(1) if match else text.strip()
+
+
+def grade_answers(
+    llm: BaseLanguageModel,
+    examples: List[Dict[str, str]],
+    predictions: List[Dict[str, str]],
+    prediction_key: str = "result",
+    max_workers: int = 8,
+) -> List[str]:
+    """
+    Grades the predicted answers with QAEvalChain, one call per example run
+    concurrently.
+
+    Parameters:
+    - llm (BaseLanguageModel): Language Model used to grade.
+    - examples (List[Dict[str, str]]): QA pairs with "query" and "answer".
+    - predictions (List[Dict[str, str]]): Predictions holding the predicted answer.
+    - prediction_key (str): Key of the predicted answer in each prediction.
+    - max_workers (int): Maximum number of concurrent grading calls.
+
+    Returns:
+    - grades (List[str]): Grade of each example, e.g. "CORRECT" or "INCORRECT".
+    """
+    eval_chain = QAEvalChain.from_llm(llm=llm)
+
+    def _grade(pair) -> str:
+        example, prediction = pair
+        graded = eval_chain.evaluate(
+            [example], [prediction], prediction_key=prediction_key
+        )
+        return _parse_grade(graded[0]["results"])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_grade, zip(examples, predictions)))
+
+
+def run_evaluation(
+    retrievers: Dict[str, BaseRetriever],
+    examples: List[Dict[str, str]],
+    answer: Optional[Callable[[str, List[Document]], str]] = None,
+    grader_llm: Optional[BaseLanguageModel] = None,
+    k: int = 5,
+    max_workers: int = 8,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Evaluates every retriever configuration on the same QA pairs. When an answer
+    function and a grader are given, the answers built from each retriever's
+    documents are also graded and the accuracy is reported.
+
+    Parameters:
+    - retrievers (Dict[str, BaseRetriever]): Retrievers by configuration name.
+    - examples (List[Dict[str, str]]): QA pairs with "query", "answer" and "chunk_id".
+    - answer (Callable, optional): Builds an answer from a query and its documents.
+    - grader_llm (BaseLanguageModel, optional): Language Model used to grade.
+    - k (int): Cut-off used for recall.
+    - max_workers (int): Maximum number of concurrent answer and grading calls.
+
+    Returns:
+    - report (Dict[str, Dict[str, Any]]): Metrics by configuration name.
+    """
+    report = {}
+
+    for name, retriever in retrievers.items():
+        metrics = evaluate_retriever(retriever, examples, k=k)
+        retrieved = metrics.pop("retrieved")
+
+        if answer is not None and grader_llm is not None:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(
+                    executor.map(
+                        answer, [example["query"] for example in examples], retrieved
+                    )
+                )
+            predictions = [
+                {**example, "result": result}
+                for example, result in zip(examples, results)
+            ]
+            grades = grade_answers(
+                grader_llm, examples, predictions, max_workers=max_workers
+            )
+            metrics["accuracy"] = sum(grade == "CORRECT" for grade in grades) / max(
+                len(grades), 1
+            )
+
+        report[name] = metrics
+
+    return report
+
+
+def print_report(report: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Pretty prints the evaluation report, one row per retriever configuration.
+
+    Parameters:
+    - report (Dict[str, Dict[str, Any]]): Metrics by configuration name.
+
+    Returns:
+    - None
+    """
+    if not report:
+        return
+
+    columns = list(next(iter(report.values())).keys())
+    print("retriever".ljust(12) + "".join(column.rjust(16) for column in columns))
+    for name, metrics in report.items():
+        print(
+            name.ljust(12) + "".join(f"{metrics[column]:16.3f}" for column in columns)
+        )